@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 import librosa
 import numpy as np
 from pathlib import Path
@@ -10,6 +11,18 @@ from typing import Union
 from asteroid_filterbanks import Encoder, Decoder, STFTFB
 
 
+@lru_cache()
+def _stft_encoder():
+    """Default STFT encoder, built once and shared by all the datasets."""
+    return Encoder(STFTFB(n_filters=512, kernel_size=400, stride=160))
+
+
+@lru_cache()
+def _stft_decoder():
+    """Default STFT decoder, built once and shared by all the calls to `decode`."""
+    return Decoder(STFTFB(n_filters=512, kernel_size=400, stride=160))
+
+
 def get_frames(video):
     import cv2  # Fix sphinx import
 
@@ -24,7 +37,14 @@ def get_frames(video):
 
     while frame < frame_count and ret:
         ret, f = video.read()
-        buffer_video[frame] = cv2.cvtColor(f, cv2.COLOR_BGR2RGB)
+        # Convert directly into the preallocated buffer.
+        slot = buffer_video[frame]
+        out = cv2.cvtColor(f, cv2.COLOR_BGR2RGB, dst=slot)
+        # OpenCV silently allocates a new array if `dst` doesn't fit the frame.
+        if not np.shares_memory(out, slot):
+            raise ValueError(
+                f"Frame {frame} has shape {f.shape[:2]}, expected {(frame_height, frame_width)}."
+            )
 
         frame += 1
     video.release()
@@ -66,6 +86,7 @@ class Signal:
         self.video_path = video_path
         self.audio_path = audio_path
         self.video_start_length = video_start_length
+        self._video = None
 
         self.embed_path = None
         self.embed = None
@@ -79,10 +100,16 @@ class Signal:
         self._check_video_embed()
 
     def _load(self, sr: int):
-        import cv2  # Fix sphinx import
-
         self.audio, _ = librosa.load(self.audio_path.as_posix(), sr=sr)
-        self.video = cv2.VideoCapture(self.video_path.as_posix())
+
+    @property
+    def video(self):
+        """Video capture, opened on first access only (the embeddings are precomputed)."""
+        if self._video is None:
+            import cv2  # Fix sphinx import
+
+            self._video = cv2.VideoCapture(self.video_path.as_posix())
+        return self._video
 
     def _check_video_embed(self, embed_ext=".npy"):
         # convert mp4 location to embedding...
@@ -135,14 +162,16 @@ class AVSpeechDataset(data.Dataset):
         self.n_src = n_src
         self.embed_dir = embed_dir
         self.input_df = pd.read_csv(input_df_path.as_posix())
-        self.stft_encoder = Encoder(STFTFB(n_filters=512, kernel_size=400, stride=160))
+        self.stft_encoder = _stft_encoder()
 
     @staticmethod
-    def encode(x: np.ndarray, p=0.3, stft_encoder=None, EPS=1e-8):
+    def encode(x: Union[np.ndarray, torch.Tensor], p=0.3, stft_encoder=None, EPS=1e-8):
         if stft_encoder is None:
-            stft_encoder = Encoder(STFTFB(n_filters=512, kernel_size=400, stride=160))
+            stft_encoder = _stft_encoder()
 
-        x = torch.from_numpy(x).float()
+        if isinstance(x, np.ndarray):
+            x = torch.from_numpy(x)
+        x = x.float()
 
         # time domain to time-frequency representation
         tf_rep = stft_encoder(x).squeeze(0) + EPS
@@ -151,11 +180,13 @@ class AVSpeechDataset(data.Dataset):
         return tf_rep
 
     @staticmethod
-    def decode(tf_rep: np.ndarray, p=0.3, stft_decoder=None, final_len=48000):
+    def decode(tf_rep: Union[np.ndarray, torch.Tensor], p=0.3, stft_decoder=None, final_len=48000):
         if stft_decoder is None:
-            stft_decoder = Decoder(STFTFB(n_filters=512, kernel_size=400, stride=160))
+            stft_decoder = _stft_decoder()
 
-        tf_rep = torch.from_numpy(tf_rep).float()
+        if isinstance(tf_rep, np.ndarray):
+            tf_rep = torch.from_numpy(tf_rep)
+        tf_rep = tf_rep.float()
 
         # power law on complex numbers
         tf_rep = (torch.abs(tf_rep) ** (1 / p)) * torch.sign(tf_rep)
@@ -21,7 +21,9 @@ class Beamformer(nn.Module):
             bf_vector: shape (batch, mics, freqs)
             mix: shape (batch, mics, freqs, frames).
         """
-        return torch.einsum("...mf,...mft->...ft", bf_vector.conj(), mix)
+        # Batched matmul over the freqs: (..., freqs, 1, mics) x (..., freqs, mics, frames)
+        bf_vector = bf_vector.conj().transpose(-1, -2).unsqueeze(-2)
+        return torch.matmul(bf_vector, mix.transpose(-3, -2)).squeeze(-2)
 
     @staticmethod
     def get_reference_mic_vects(
@@ -94,7 +96,7 @@ class RTFMVDRBeamformer(Beamformer):
         """
         # TODO: Implement several RTF estimation strategies, and choose one here, or expose all.
         # Get relative transfer function (1st PCA of Σss)
-        e_val, e_vec = torch.linalg.eigh(target_scm.permute(0, 3, 1, 2))
+        e_val, e_vec = _eigh(target_scm.permute(0, 3, 1, 2))
         rtf_vect = e_vec[..., -1]  # bfm
         return self.from_rtf_vect(mix=mix, rtf_vec=rtf_vect.transpose(-1, -2), noise_scm=noise_scm)
 
@@ -237,7 +239,7 @@ class GEVBeamformer(Beamformer):
     @staticmethod
     def compute_beamforming_vector(target_scm: torch.Tensor, noise_scm: torch.Tensor):
         noise_scm_t = noise_scm.permute(0, 3, 1, 2)
-        noise_scm_t = condition_scm(noise_scm_t, 1e-6)
+        noise_scm_t = _condition_scm(noise_scm_t, 1e-6)
         e_val, e_vec = generalized_eigenvalue_decomposition(
             target_scm.permute(0, 3, 1, 2), noise_scm_t
         )
@@ -340,19 +342,27 @@ def compute_scm(x: torch.Tensor, mask: torch.Tensor = None, normalize: bool = Tr
         normalize (bool): Whether to normalize with the mask mean per bin.
 
     Returns:
-        torch.ComplexTensor, the SCM with shape (batch, mics, mics, freqs)
+        torch.ComplexTensor, the SCM with shape (batch, mics, mics, freqs).
+        It is stored as (batch, freqs, mics, mics), the layout used by the beamformers,
+        so that ``scm.permute(0, 3, 1, 2)`` is contiguous and doesn't require a copy.
     """
     batch, mics, freqs, frames = x.shape
     if mask is None:
-        mask = torch.ones(batch, 1, freqs, frames)
-    if mask.ndim == 3:
-        mask = mask[:, None]
+        # Uniform mask: no need to build it, the normalization is the number of frames.
+        x_masked = x
+    else:
+        if mask.ndim == 3:
+            mask = mask[:, None]
+        if normalize:
+            # Normalize the mask beforehand, instead of the SCM afterwards.
+            mask = mask / mask.sum(-1, keepdim=True)
+        x_masked = mask * x
 
-    # torch.matmul((mask * x).transpose(1, 2), x.conj().permute(0, 2, 3, 1))
-    scm = torch.einsum("bmft,bnft->bmnf", mask * x, x.conj())
-    if normalize:
-        scm /= mask.sum(-1, keepdim=True).transpose(-1, -2)
-    return scm
+    # Batched matmul over the freqs: (batch, freqs, mics, frames) x (batch, freqs, frames, mics)
+    scm = torch.matmul(x_masked.transpose(1, 2), x.conj().permute(0, 2, 3, 1))
+    if mask is None and normalize:
+        scm /= frames
+    return scm.permute(0, 2, 3, 1)  # bfmn -> bmnf
 
 
 def get_optimal_reference_mic(
@@ -394,9 +404,17 @@ def condition_scm(x, eps=1e-6, dim1=-2, dim2=-1):
     # Assume 4d with ...mm
     if dim1 != -2 or dim2 != -1:
         raise NotImplementedError
-    scale = eps * batch_trace(x, dim1=dim1, dim2=dim2)[..., None, None] / x.shape[dim1]
-    scaled_eye = torch.eye(x.shape[dim1], device=x.device)[None, None] * scale
-    return (x + scaled_eye) / (1 + eps)
+    return _condition_scm(x, eps)
+
+
+def _condition_scm(x, eps=1e-6):
+    """:func:`condition_scm` along the last two dimensions, in a single pass over `x`."""
+    inv_norm = 1 / (1 + eps)
+    scale = batch_trace(x)[..., None] * (eps * inv_norm / x.shape[-1])
+    # Add to the diagonal of the output instead of building a scaled identity matrix.
+    x = x * inv_norm
+    x.diagonal(dim1=-2, dim2=-1).add_(scale)
+    return x
 
 
 def batch_trace(x, dim1=-2, dim2=-1):
@@ -405,7 +423,8 @@ def batch_trace(x, dim1=-2, dim2=-1):
 
 
 def stable_solve(b, a):
-    """Return torch.solve if `a` is non-singular, else regularize `a` and return torch.solve."""
+    """Return torch.linalg.solve if `a` is non-singular, else regularize `a` and return
+    torch.linalg.solve."""
     # Only run it in double
     input_dtype = _common_dtype(b, a)
     solve_dtype = input_dtype
@@ -415,11 +434,39 @@ def stable_solve(b, a):
 
 
 def _stable_solve(b, a, eps=1e-6):
-    try:
-        return torch.linalg.solve(a, b)
-    except RuntimeError:
-        a = condition_scm(a, eps)
-        return torch.linalg.solve(a, b)
+    if a.shape[-1] == 2:
+        return _stable_solve_2x2(b, a, eps=eps)
+    # solve_ex reports singular matrices in `info` instead of raising.
+    x, info = torch.linalg.solve_ex(a, b)
+    if torch.any(info):
+        a = _condition_scm(a, eps)
+        x = torch.linalg.solve(a, b)
+    return x
+
+
+def _stable_solve_2x2(b, a, eps=1e-6):
+    """Closed-form solve for 2x2 matrices, avoids batched LAPACK/cuSOLVER calls."""
+    adj, det = _adjugate_and_det(a)
+    if torch.any(det == 0):
+        a = _condition_scm(a, eps)
+        adj, det = _adjugate_and_det(a)
+        if torch.any(det == 0):
+            # Conditioning can't help (e.g. all-zero SCM), raise like the general case.
+            return torch.linalg.solve(a, b)
+    return torch.matmul(adj, b) / det[..., None, None]
+
+
+def _adjugate_and_det(a):
+    """Return the adjugate and the determinant of (batches of) 2x2 matrices."""
+    det = a[..., 0, 0] * a[..., 1, 1] - a[..., 0, 1] * a[..., 1, 0]
+    adj = torch.stack(
+        [
+            torch.stack([a[..., 1, 1], -a[..., 0, 1]], dim=-1),
+            torch.stack([-a[..., 1, 0], a[..., 0, 0]], dim=-1),
+        ],
+        dim=-2,
+    )
+    return adj, det
 
 
 def stable_cholesky(input, upper=False, out=None, eps=1e-6):
@@ -446,7 +493,7 @@ def _stable_cholesky(input, upper=False, out=None, eps=1e-6):
             return torch.linalg.cholesky(input, out=out).mH
         return torch.linalg.cholesky(input, out=out)
     except RuntimeError:
-        input = condition_scm(input, eps)
+        input = _condition_scm(input, eps)
         if upper:
             return torch.linalg.cholesky(input, out=out).mH
         return torch.linalg.cholesky(input, out=out)
@@ -467,16 +514,68 @@ def generalized_eigenvalue_decomposition(a, b):
 
 def _generalized_eigenvalue_decomposition(a, b):
     cholesky = stable_cholesky(b)
-    inv_cholesky = torch.inverse(cholesky)
-    # Compute C matrix L⁻1 A L^-T
-    cmat = inv_cholesky @ a @ inv_cholesky.conj().transpose(-1, -2)
+    # Compute C matrix L⁻1 A L^-H with triangular solves, without inverting L.
+    cmat = torch.linalg.solve_triangular(cholesky, a, upper=False)
+    cmat = torch.linalg.solve_triangular(cholesky, cmat.mH, upper=False).mH
     # Performing the eigenvalue decomposition
-    e_val, e_vec = torch.linalg.eigh(cmat)
-    # Collecting the eigenvectors
-    e_vec = torch.matmul(inv_cholesky.conj().transpose(-1, -2), e_vec)
+    e_val, e_vec = _eigh(cmat)
+    # Collecting the eigenvectors L^-H e_vec
+    e_vec = torch.linalg.solve_triangular(cholesky.mH, e_vec, upper=True)
+    return e_val, e_vec
+
+
+def _eigh(x):
+    """Eigenvalue decomposition of Hermitian matrices, see :func:`torch.linalg.eigh`.
+    Uses a closed-form solution for 2x2 matrices, whose eigen vectors can differ from
+    :func:`torch.linalg.eigh`'s by a phase (see :func:`_eigh_2x2`).
+    """
+    if x.shape[-1] == 2:
+        return _eigh_2x2(x)
+    return torch.linalg.eigh(x)
+
+
+def _eigh_2x2(x):
+    """Closed-form :func:`torch.linalg.eigh` for (batches of) 2x2 Hermitian matrices.
+    Returns eigen values (ascending order) and eigen vectors, whose first component is real
+    and non-negative. This is a deterministic convention of the closed form: LAPACK also
+    returns a real first component, but its sign is arbitrary.
+    """
+    # Use the lower triangle, as torch.linalg.eigh.
+    a, d, c = x[..., 0, 0].real, x[..., 1, 1].real, x[..., 1, 0]
+    half_diff = (a - d) / 2
+    radius = torch.sqrt(half_diff**2 + c.abs() ** 2)
+    mean = (a + d) / 2
+    e_val = torch.stack([mean - radius, mean + radius], dim=-1)
+
+    # Eigen vector of the largest eigen value, from the row of (x - lambda I)
+    # which doesn't suffer from cancellation.
+    row_1 = torch.stack([c.conj(), (radius - half_diff).to(c.dtype)], dim=-1)
+    row_2 = torch.stack([(half_diff + radius).to(c.dtype), c], dim=-1)
+    vec = torch.where((half_diff < 0)[..., None], row_1, row_2)
+    norm = torch.linalg.vector_norm(vec, dim=-1, keepdim=True)
+    # Multiple of the identity: any basis is an eigen basis.
+    first_axis = torch.zeros_like(vec)
+    first_axis[..., 0] = 1
+    vec = torch.where(norm > 0, vec / norm.clamp(min=torch.finfo(norm.dtype).tiny), first_axis)
+    # The other eigen vector is orthogonal.
+    other_vec = torch.stack([-vec[..., 1].conj(), vec[..., 0].conj()], dim=-1)
+    # Fix the phases so that the first component is real and non-negative.
+    e_vec = torch.stack([_real_first_component(other_vec), _real_first_component(vec)], dim=-1)
     return e_val, e_vec
 
 
+def _real_first_component(vec):
+    """Rotate (batches of) 2D vectors so that their first component is real and non-negative."""
+    first = vec[..., 0]
+    first_abs = first.abs()
+    phase = torch.where(
+        first_abs > 0,
+        first / first_abs.clamp(min=torch.finfo(first_abs.dtype).tiny),
+        torch.ones_like(first),
+    )
+    return torch.stack([first_abs.to(vec.dtype), vec[..., 1] * phase.conj()], dim=-1)
+
+
 def _common_dtype(*args):
     all_dtypes = [a.dtype for a in args]
     if len(set(all_dtypes)) > 1:
@@ -1,8 +1,12 @@
 import warnings
+from functools import lru_cache
 from itertools import combinations
 import torch
 from torch import nn
 
+# Maximum number of rows (batch * partitions) passed to the loss function in one call.
+_MAX_LOSS_ROWS = 16
+
 
 class MixITLossWrapper(nn.Module):
     r"""Mixture invariant loss wrapper.
@@ -55,7 +59,8 @@ class MixITLossWrapper(nn.Module):
             return_est: Boolean. Whether to return the estimated mixtures
                 estimates (To compute metrics or to save example).
             **kwargs: additional keyword argument that will be passed to the
-                loss function.
+                loss function. Tensors whose first dimension is the batch size are
+                repeated for each partition, see :meth:`loss_set_from_parts`.
 
         Returns:
             - Best partition loss for each batch sample, average over
@@ -67,12 +72,13 @@ class MixITLossWrapper(nn.Module):
         assert est_targets.shape[0] == targets.shape[0]
         assert est_targets.shape[2] == targets.shape[2]
 
+        # Use the cached partitions directly, the public static methods copy them.
         if not self.generalized:
-            min_loss, min_loss_idx, parts = self.best_part_mixit(
+            min_loss, min_loss_idx, parts = _best_part_mixit(
                 self.loss_func, est_targets, targets, **kwargs
             )
         else:
-            min_loss, min_loss_idx, parts = self.best_part_mixit_generalized(
+            min_loss, min_loss_idx, parts = _best_part_mixit_generalized(
                 self.loss_func, est_targets, targets, **kwargs
             )
 
@@ -82,7 +88,11 @@ class MixITLossWrapper(nn.Module):
             return returned_loss
 
         # Order and sum on the best partition to get the estimated mixtures
-        reordered = self.reorder_source(est_targets, targets, min_loss_idx, parts)
+        nsrc, nmix = est_targets.shape[1], targets.shape[1]
+        parts_mask = _parts_mask(
+            nsrc, nmix, self.generalized, est_targets.device, est_targets.dtype
+        )
+        reordered = self.reorder_source(est_targets, targets, min_loss_idx, parts, parts_mask)
         return returned_loss, reordered
 
     @staticmethod
@@ -112,34 +122,10 @@ class MixITLossWrapper(nn.Module):
               list of the possible partitions of the sources.
 
         """
-        nmix = targets.shape[1]
-        nsrc = est_targets.shape[1]
-        if nsrc % nmix != 0:
-            raise ValueError("The mixtures are assumed to contain the same number of sources")
-        nsrcmix = nsrc // nmix
-
-        # Generate all unique partitions of size k from a list lst of
-        # length n, where l = n // k is the number of parts. The total
-        # number of such partitions is: NPK(n,k) = n! / ((k!)^l * l!)
-        # Algorithm recursively distributes items over parts
-        def parts_mixit(lst, k, l):
-            if l == 0:
-                yield []
-            else:
-                for c in combinations(lst, k):
-                    rest = [x for x in lst if x not in c]
-                    for r in parts_mixit(rest, k, l - 1):
-                        yield [list(c), *r]
-
-        # Generate all the possible partitions
-        parts = list(parts_mixit(range(nsrc), nsrcmix, nmix))
-        # Compute the loss corresponding to each partition
-        loss_set = MixITLossWrapper.loss_set_from_parts(
-            loss_func, est_targets=est_targets, targets=targets, parts=parts, **kwargs
+        min_loss, min_loss_indexes, parts = _best_part_mixit(
+            loss_func, est_targets, targets, **kwargs
         )
-        # Indexes and values of min losses for each batch element
-        min_loss, min_loss_indexes = torch.min(loss_set, dim=1, keepdim=True)
-        return min_loss, min_loss_indexes, parts
+        return min_loss, min_loss_indexes, _as_lists(parts)
 
     @staticmethod
     def best_part_mixit_generalized(loss_func, est_targets, targets, **kwargs):
@@ -168,48 +154,29 @@ class MixITLossWrapper(nn.Module):
             - :class:`list`:
               list of the possible partitions of the sources.
         """
-        nmix = targets.shape[1]  # number of mixtures
-        nsrc = est_targets.shape[1]  # number of estimated sources
-        if nmix != 2:
-            raise ValueError("Works only with two mixtures")
-
-        # Generate all unique partitions of any size from a list lst of
-        # length n. Algorithm recursively distributes items over parts
-        def parts_mixit_gen(lst):
-            partitions = []
-            for k in range(len(lst) + 1):
-                for c in combinations(lst, k):
-                    rest = [x for x in lst if x not in c]
-                    partitions.append([list(c), rest])
-            return partitions
-
-        # Generate all the possible partitions
-        parts = parts_mixit_gen(range(nsrc))
-        # Compute the loss corresponding to each partition
-        loss_set = MixITLossWrapper.loss_set_from_parts(
-            loss_func, est_targets=est_targets, targets=targets, parts=parts, **kwargs
+        min_loss, min_loss_indexes, parts = _best_part_mixit_generalized(
+            loss_func, est_targets, targets, **kwargs
         )
-        # Indexes and values of min losses for each batch element
-        min_loss, min_loss_indexes = torch.min(loss_set, dim=1, keepdim=True)
-        return min_loss, min_loss_indexes, parts
+        return min_loss, min_loss_indexes, _as_lists(parts)
 
     @staticmethod
     def loss_set_from_parts(loss_func, est_targets, targets, parts, **kwargs):
-        """Common loop between both best_part_mixit"""
-        loss_set = []
-        for partition in parts:
-            # sum the sources according to the given partition
-            est_mixes = torch.stack([est_targets[:, idx, :].sum(1) for idx in partition], dim=1)
-            # get loss for the given partition
-            loss_partition = loss_func(est_mixes, targets, **kwargs)
-            if loss_partition.ndim != 1:
-                raise ValueError("Loss function return value should be of size (batch,).")
-            loss_set.append(loss_partition[:, None])
-        loss_set = torch.cat(loss_set, dim=1)
-        return loss_set
+        """Compute the loss of every partition.
+
+        The estimated mixtures of several partitions are stacked along the batch
+        axis, ``loss_func`` is called on tensors of batch size ``batch * n`` where ``n``
+        partitions are processed at once (at least one, and as many as fit in 16 rows).
+        Tensors in ``kwargs`` whose first dimension is ``batch`` (e.g. per-sample
+        weights or lengths) are repeated accordingly, other values are passed as is.
+
+        Returns:
+            :class:`torch.Tensor`: The losses of shape :math:`(batch, len(parts))`.
+        """
+        parts_mask = _parts_to_mask(parts, est_targets.shape[1]).to(est_targets)
+        return _loss_set_from_mask(loss_func, est_targets, targets, parts_mask, **kwargs)
 
     @staticmethod
-    def reorder_source(est_targets, targets, min_loss_idx, parts):
+    def reorder_source(est_targets, targets, min_loss_idx, parts, parts_mask=None):
         """Reorder sources according to the best partition.
 
         Args:
@@ -219,18 +186,171 @@ class MixITLossWrapper(nn.Module):
                 The batch of training targets.
             min_loss_idx: torch.LongTensor. The indexes of the best permutations.
             parts: list of the possible partitions of the sources.
+            parts_mask: torch.Tensor, optional. Membership mask of `parts`, of shape
+                :math:`(len(parts), nmix, nsrc)`. Built from `parts` if not given.
 
         Returns:
             :class:`torch.Tensor`: Reordered sources of shape :math:`(batch, nmix, time)`.
 
         """
+        batch, nsrc = est_targets.shape[:2]
+        if parts_mask is None:
+            parts_mask = _parts_to_mask(parts, nsrc).to(est_targets)
         # For each batch there is a different min_loss_idx
-        ordered = torch.zeros_like(targets)
-        for b, idx in enumerate(min_loss_idx):
-            right_partition = parts[idx]
-            # Sum the estimated sources to get the estimated mixtures
-            ordered[b, :, :] = torch.stack(
-                [est_targets[b, idx, :][None, :, :].sum(1) for idx in right_partition], dim=1
-            )
+        best_mask = parts_mask[min_loss_idx.view(-1)]  # (batch, nmix, nsrc)
+        # Sum the estimated sources to get the estimated mixtures
+        ordered = torch.matmul(best_mask, est_targets.reshape(batch, nsrc, -1))
+        return ordered.reshape(targets.shape)
+
+
+def _best_part_mixit(loss_func, est_targets, targets, **kwargs):
+    """See :meth:`MixITLossWrapper.best_part_mixit`, returns the cached partitions (tuples)."""
+    nmix = targets.shape[1]
+    nsrc = est_targets.shape[1]
+    if nsrc % nmix != 0:
+        raise ValueError("The mixtures are assumed to contain the same number of sources")
+
+    # Generate all the possible partitions (cached, only depends on shapes)
+    parts = _parts_mixit(nsrc, nmix)
+    parts_mask = _parts_mask(nsrc, nmix, False, est_targets.device, est_targets.dtype)
+    # Compute the loss corresponding to each partition
+    loss_set = _loss_set_from_mask(loss_func, est_targets, targets, parts_mask, **kwargs)
+    # Indexes and values of min losses for each batch element
+    min_loss, min_loss_indexes = torch.min(loss_set, dim=1, keepdim=True)
+    return min_loss, min_loss_indexes, parts
+
+
+def _best_part_mixit_generalized(loss_func, est_targets, targets, **kwargs):
+    """See :meth:`MixITLossWrapper.best_part_mixit_generalized`, returns the cached
+    partitions (tuples).
+    """
+    nmix = targets.shape[1]  # number of mixtures
+    nsrc = est_targets.shape[1]  # number of estimated sources
+    if nmix != 2:
+        raise ValueError("Works only with two mixtures")
+
+    # Generate all the possible partitions (cached, only depends on shapes)
+    parts = _parts_mixit_gen(nsrc)
+    parts_mask = _parts_mask(nsrc, nmix, True, est_targets.device, est_targets.dtype)
+    # Compute the loss corresponding to each partition
+    loss_set = _loss_set_from_mask(loss_func, est_targets, targets, parts_mask, **kwargs)
+    # Indexes and values of min losses for each batch element
+    min_loss, min_loss_indexes = torch.min(loss_set, dim=1, keepdim=True)
+    return min_loss, min_loss_indexes, parts
+
+
+@lru_cache(maxsize=32)
+def _parts_mixit(nsrc, nmix):
+    """Return all the partitions of ``nsrc`` sources into ``nmix`` parts of equal size.
+
+    The partitions only depend on the shapes, they are computed once and cached,
+    as tuples so that callers can't modify the cached value.
+    """
+    nsrcmix = nsrc // nmix
+
+    # Generate all unique partitions of size k from a list lst of
+    # length n, where l = n // k is the number of parts. The total
+    # number of such partitions is: NPK(n,k) = n! / ((k!)^l * l!)
+    # Algorithm recursively distributes items over parts
+    def parts_mixit(lst, k, l):
+        if l == 0:
+            yield []
+        else:
+            for c in combinations(lst, k):
+                chosen = set(c)
+                rest = [x for x in lst if x not in chosen]
+                for r in parts_mixit(rest, k, l - 1):
+                    yield [c, *r]
+
+    return tuple(tuple(p) for p in parts_mixit(range(nsrc), nsrcmix, nmix))
 
-        return ordered
+
+@lru_cache(maxsize=32)
+def _parts_mixit_gen(nsrc):
+    """Return all the partitions of ``nsrc`` sources into two parts of any size.
+
+    The partitions only depend on the shapes, they are computed once and cached,
+    as tuples so that callers can't modify the cached value.
+    """
+
+    # Generate all unique partitions of any size from a list lst of
+    # length n. Algorithm recursively distributes items over parts
+    def parts_mixit_gen(lst):
+        partitions = []
+        for k in range(len(lst) + 1):
+            for c in combinations(lst, k):
+                chosen = set(c)
+                partitions.append((c, tuple(x for x in lst if x not in chosen)))
+        return tuple(partitions)
+
+    return parts_mixit_gen(range(nsrc))
+
+
+def _as_lists(parts):
+    """Copy of cached partitions as (mutable) lists of lists."""
+    return [[list(sources) for sources in partition] for partition in parts]
+
+
+def _parts_to_mask(parts, nsrc):
+    """Convert a list of partitions to a tensor of shape :math:`(len(parts), nmix, nsrc)`
+    where ``mask[p, m, s]`` is one if source ``s`` is summed in mixture ``m`` for partition ``p``.
+    """
+    part_idx, mix_idx, src_idx = [], [], []
+    for p, partition in enumerate(parts):
+        for m, sources in enumerate(partition):
+            part_idx += [p] * len(sources)
+            mix_idx += [m] * len(sources)
+            src_idx += sources
+    mask = torch.zeros(len(parts), len(parts[0]), nsrc)
+    mask[part_idx, mix_idx, src_idx] = 1.0
+    return mask
+
+
+@lru_cache(maxsize=32)
+def _parts_mask(nsrc, nmix, generalized, device, dtype):
+    """Cached partition mask (see :func:`_parts_to_mask`) on a given device and dtype."""
+    parts = _parts_mixit_gen(nsrc) if generalized else _parts_mixit(nsrc, nmix)
+    # The mask outlives the call, it should not be an inference tensor if the first
+    # call happens under `torch.inference_mode` (e.g. Lightning's validation sanity check).
+    with torch.inference_mode(False):
+        return _parts_to_mask(parts, nsrc).to(device=device, dtype=dtype)
+
+
+def _loss_set_from_mask(loss_func, est_targets, targets, parts_mask, **kwargs):
+    """Compute the losses of all partitions described by ``parts_mask``, see
+    :meth:`MixITLossWrapper.loss_set_from_parts`.
+    """
+    batch, nsrc = est_targets.shape[:2]
+    n_parts = parts_mask.shape[0]
+    # Number of partitions per call, bounded so that the working set stays small.
+    chunk = max(1, _MAX_LOSS_ROWS // batch)
+    loss_set = [
+        _loss_set_chunk(loss_func, est_targets, targets, parts_mask[start : start + chunk], **kwargs)
+        for start in range(0, n_parts, chunk)
+    ]
+    return torch.cat(loss_set, dim=1)
+
+
+def _loss_set_chunk(loss_func, est_targets, targets, parts_mask, **kwargs):
+    """Losses of the partitions of ``parts_mask`` with a single call to ``loss_func``."""
+    batch, nsrc = est_targets.shape[:2]
+    n_parts, nmix = parts_mask.shape[:2]
+    # Sum the sources of the partitions at once: (P * nmix, nsrc) x (batch, nsrc, time)
+    est_mixes = torch.matmul(parts_mask.reshape(-1, nsrc), est_targets.reshape(batch, nsrc, -1))
+    est_mixes = est_mixes.reshape(batch * n_parts, nmix, *est_targets.shape[2:])
+    # Repeat the targets for each partition
+    targets = targets.unsqueeze(1).expand(-1, n_parts, *targets.shape[1:])
+    targets = targets.reshape(batch * n_parts, *targets.shape[2:])
+    # Same for the keyword arguments with a batch dimension
+    kwargs = {
+        k: v.repeat_interleave(n_parts, dim=0) if _has_batch_dim(v, batch) else v
+        for k, v in kwargs.items()
+    }
+    loss_set = loss_func(est_mixes, targets, **kwargs)
+    if loss_set.ndim != 1:
+        raise ValueError("Loss function return value should be of size (batch,).")
+    return loss_set.reshape(batch, n_parts)
+
+
+def _has_batch_dim(value, batch):
+    return torch.is_tensor(value) and value.ndim > 0 and value.shape[0] == batch
@@ -13,6 +13,9 @@ class SinkPITLossWrapper(nn.Module):
             Supposed to be an even number.
         hungarian_validation (boolean) : Whether to use the Hungarian algorithm
             for the validation. (default = True)
+        tol (float, optional): Stop the Sinkhorn iterations early once the soft
+            permutation is doubly stochastic up to `tol`. (default = None, run
+            all the iterations). See :meth:`~SinkPITLossWrapper.best_softperm_sinkhorn`.
 
     ``loss_func`` computes pairwise losses and returns a torch.Tensor of shape
     :math:`(batch, n\_src, n\_src)`. Each element :math:`(batch, i, j)` corresponds to
@@ -52,12 +55,13 @@ class SinkPITLossWrapper(nn.Module):
         >>> trainer.fit(system)
     """
 
-    def __init__(self, loss_func, n_iter=200, hungarian_validation=True):
+    def __init__(self, loss_func, n_iter=200, hungarian_validation=True, tol=None):
         super().__init__()
         self.loss_func = loss_func
         self._beta = 10
         self.n_iter = n_iter
         self.hungarian_validation = hungarian_validation
+        self.tol = tol
 
     @property
     def beta(self):
@@ -102,7 +106,7 @@ class SinkPITLossWrapper(nn.Module):
             if self.training or not self.hungarian_validation:
                 # Train or sinkhorn validation
                 min_loss, soft_perm = self.best_softperm_sinkhorn(
-                    pw_losses, self._beta, self.n_iter
+                    pw_losses, self._beta, self.n_iter, tol=self.tol
                 )
                 mean_loss = torch.mean(min_loss)
                 return mean_loss
@@ -119,7 +123,7 @@ class SinkPITLossWrapper(nn.Module):
             return mean_loss, reordered
 
     @staticmethod
-    def best_softperm_sinkhorn(pair_wise_losses, beta=10, n_iter=200):
+    def best_softperm_sinkhorn(pair_wise_losses, beta=10, n_iter=200, tol=None):
         r"""Compute an approximate PIT loss using Sinkhorn's algorithm.
         See http://arxiv.org/abs/2010.11871
 
@@ -128,6 +132,9 @@ class SinkPITLossWrapper(nn.Module):
                 Tensor of shape :math:`(batch, n_src, n_src)`. Pairwise losses.
             beta (float) : Inverse temperature parameter. (default = 10)
             n_iter (int) : Number of iteration. Even number. (default = 200)
+            tol (float, optional): If given, stop before `n_iter` iterations once
+                the rows and columns of the soft permutation sum to one up to `tol`.
+                Checked every 20 iterations. (default = None)
 
         Returns:
             - :class:`torch.Tensor`:
@@ -143,6 +150,10 @@ class SinkPITLossWrapper(nn.Module):
         for it in range(n_iter // 2):
             Z = Z - torch.logsumexp(Z, axis=1, keepdim=True)
             Z = Z - torch.logsumexp(Z, axis=2, keepdim=True)
+            # Z is normalized along axis 2, check the sums along axis 1.
+            if tol is not None and it % 10 == 0:
+                if torch.max(torch.abs(torch.exp(Z).sum(1) - 1)) < tol:
+                    break
         min_loss = torch.einsum("bij,bij->b", C + Z / beta, torch.exp(Z))
         min_loss = min_loss / n_src
         return min_loss, torch.exp(Z)
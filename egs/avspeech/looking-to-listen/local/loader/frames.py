@@ -25,7 +25,9 @@ def input_face_embeddings(
     instead of throwing an error it zeros the input
     for embedder.
 
-    NOTE: Memory hungry function, hence the profiler.
+    NOTE: The face detection runs on all frames at once
+    when they have the same size (always the case for
+    the frames of a video), else frame by frame.
 
     Args:
         frames: Frames from the video
@@ -42,18 +44,27 @@ def input_face_embeddings(
         device = torch.device("cuda:0")
     else:
         device = torch.device("cpu")
-    result_cropped_tensors = []
-    no_face_indices = []
-    for i, f in enumerate(frames):
-        if is_path:
-            frame = Image.open(f)
+
+    if is_path:
+        images = [_read_image(f) for f in frames]
+    else:
+        # No copy when the frames are already uint8.
+        images = [Image.fromarray(np.asarray(f, dtype=np.uint8)) for f in frames]
+
+    with torch.no_grad():
+        if len({image.size for image in images}) == 1:
+            # Detect the faces of all the frames in a single batched forward.
+            batch_bounding_boxes, _ = mtcnn.detect(images)
         else:
-            frame = Image.fromarray(f.astype("uint8"))
+            # MTCNN can only batch images of the same size.
+            batch_bounding_boxes = [mtcnn.detect(image)[0] for image in images]
 
+    result_cropped_tensors = []
+    no_face_indices = []
+    for i, (frame, bounding_box) in enumerate(zip(images, batch_bounding_boxes)):
         with torch.no_grad():
             cropped_tensors = None
-            height, width, c = f.shape
-            bounding_box, prob = mtcnn.detect(frame)
+            width, height = frame.size
 
             if bounding_box is not None:
                 for box in bounding_box:
@@ -83,16 +94,14 @@ def input_face_embeddings(
             saveimg = np.squeeze(saveimg.transpose(1, 2, 0))
             Image.fromarray(saveimg).save(f"{name}_{i}.png")
 
-        result_cropped_tensors.append(cropped_tensors.to(device))
+        result_cropped_tensors.append(cropped_tensors)
 
     if len(no_face_indices) > 20:
         # few videos start with silence, allow 0.5 seconds of silence else remove
         return None
-    del frames
-    # Stack all frames
-    result_cropped_tensors = torch.stack(result_cropped_tensors)
+    # Stack all frames and move them to the device at once
+    result_cropped_tensors = torch.stack(result_cropped_tensors).to(device)
     # Embed all frames
-    result_cropped_tensors = result_cropped_tensors.to(device)
     if use_half:
         result_cropped_tensors = result_cropped_tensors.half()
 
@@ -103,6 +112,12 @@ def input_face_embeddings(
     return emb.to(cpu_device)
 
 
+def _read_image(path):
+    """Read an image from the filesystem without keeping its file open."""
+    with Image.open(path) as image:
+        return image.copy()
+
+
 if __name__ == "__main__":
     mtcnn = MTCNN(keep_all=True).eval()
     resnet = InceptionResnetV1(pretrained="vggface2").eval()
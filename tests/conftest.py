@@ -0,0 +1,12 @@
+import os
+import torch
+
+
+def pytest_configure(config):
+    """When running with pytest-xdist (``pytest -n auto``), share the cores between
+    the workers instead of letting each of them spawn one thread per core."""
+    n_workers = os.environ.get("PYTEST_XDIST_WORKER_COUNT")
+    if n_workers is None:
+        return
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // int(n_workers)))
+    torch.set_num_interop_threads(1)
@@ -1,5 +1,6 @@
 import torch
 import pytest
+from torch.testing import assert_close
 from asteroid_filterbanks import make_enc_dec, transforms as tr
 
 from asteroid.dsp.beamforming import (
@@ -10,7 +11,12 @@ from asteroid.dsp.beamforming import (
     SDWMWFBeamformer,
     GEVBeamformer,
     GEVDBeamformer,
+    compute_scm,
     stable_cholesky,
+    stable_solve,
+    condition_scm,
+    _eigh_2x2,
+    _generalized_eigenvalue_decomposition,
 )
 
 
@@ -97,3 +103,100 @@ def test_stable_cholesky():
     a = torch.randn(3, 3)
     a = torch.mm(a, a.t())  # make symmetric positive-definite
     stable_cholesky(a)
+
+
+@pytest.mark.skipif(not torch_has_complex_support, reason="No complex support ")
+@pytest.mark.parametrize("use_mask", [True, False])
+def test_scm_layout(use_mask):
+    x = stft(torch.randn(2, 3, 16000))
+    mask = torch.rand(2, *x.shape[2:]) if use_mask else None
+    scm = SCM()(x, mask=mask)
+    assert scm.shape == (2, 3, 3, x.shape[2])
+    # Beamformers work on (batch, freqs, mics, mics) matrices, this should be free.
+    assert scm.permute(0, 3, 1, 2).is_contiguous()
+
+
+@pytest.mark.parametrize("batch_shape", [(2,), (4, 2)])
+def test_apply_beamforming_vector(batch_shape):
+    bf_vector = torch.randn(*batch_shape, 3, 5, dtype=torch.complex128)
+    mix = torch.randn(*batch_shape, 3, 5, 7, dtype=torch.complex128)
+    assert_close(
+        Beamformer.apply_beamforming_vector(bf_vector, mix),
+        torch.einsum("...mf,...mft->...ft", bf_vector.conj(), mix),
+    )
+
+
+@pytest.mark.parametrize("mask_shape", [None, (2, 5, 7), (2, 1, 5, 7), (2, 3, 5, 7)])
+@pytest.mark.parametrize("normalize", [True, False])
+def test_scm_values(mask_shape, normalize):
+    x = torch.randn(2, 3, 5, 7, dtype=torch.complex128)
+    mask = None if mask_shape is None else torch.rand(mask_shape, dtype=torch.float64)
+    # Reference implementation with an explicit mask
+    ref_mask = torch.ones(2, 1, 5, 7, dtype=torch.float64) if mask is None else mask
+    if ref_mask.ndim == 3:
+        ref_mask = ref_mask[:, None]
+    ref_scm = torch.einsum("bmft,bnft->bmnf", ref_mask * x, x.conj())
+    if normalize:
+        ref_scm = ref_scm / ref_mask.sum(-1, keepdim=True).transpose(-1, -2)
+    assert_close(compute_scm(x, mask=mask, normalize=normalize), ref_scm)
+
+
+@pytest.mark.parametrize("dtype", [torch.float64, torch.complex128])
+def test_eigh_2x2(dtype):
+    x = torch.randn(4, 5, 2, 2, dtype=dtype)
+    x = x @ x.mH  # make hermitian
+    x[0, 0] = torch.eye(2, dtype=dtype)  # Repeated eigen values
+    x[0, 1] = torch.diag(torch.tensor([2.0, 1.0])).to(dtype)  # Already diagonal
+    e_val, e_vec = _eigh_2x2(x)
+    assert_close(e_val, torch.linalg.eigh(x)[0])
+    # Eigen vectors are defined up to a phase, check the decomposition instead.
+    assert_close(e_vec @ torch.diag_embed(e_val).to(dtype) @ e_vec.mH, x)
+    assert_close(e_vec.mH @ e_vec, torch.eye(2, dtype=dtype).expand_as(x))
+    # Phase convention of the closed form: real and non-negative first components.
+    first_components = e_vec[..., 0, :]
+    if dtype.is_complex:
+        assert torch.all(first_components.imag == 0)
+        first_components = first_components.real
+    assert torch.all(first_components >= 0)
+
+
+@pytest.mark.parametrize("n_mics", [2, 4])
+def test_generalized_eigenvalue_decomposition(n_mics):
+    dtype = torch.complex128
+    a = torch.randn(2, 5, n_mics, n_mics, dtype=dtype)
+    a = a + a.mH  # make hermitian
+    b = torch.randn(2, 5, n_mics, n_mics, dtype=dtype)
+    b = b @ b.mH + torch.eye(n_mics, dtype=dtype)  # make positive-definite
+    e_val, e_vec = _generalized_eigenvalue_decomposition(a, b)
+    assert_close(a @ e_vec, b @ e_vec @ torch.diag_embed(e_val).to(dtype))
+    assert_close(e_vec.mH @ b @ e_vec, torch.eye(n_mics, dtype=dtype).expand_as(b))
+
+
+@pytest.mark.parametrize("n_mics", [2, 3, 4])
+@pytest.mark.parametrize("dtype", [torch.float64, torch.complex128])
+def test_condition_scm(n_mics, dtype):
+    eps = 1e-2
+    x = torch.randn(2, 5, n_mics, n_mics, dtype=dtype)
+    x = x @ x.mH
+    x_copy = x.clone()
+    trace = torch.diagonal(x, dim1=-2, dim2=-1).sum(-1)[..., None, None]
+    expected = (x + eps * trace / n_mics * torch.eye(n_mics, dtype=dtype)) / (1 + eps)
+    assert_close(condition_scm(x, eps=eps), expected)
+    # The input is left untouched.
+    assert torch.equal(x, x_copy)
+
+
+@pytest.mark.parametrize("n_mics", [2, 3, 4])
+@pytest.mark.parametrize("dtype", [torch.float64, torch.complex128])
+def test_stable_solve(n_mics, dtype):
+    a = torch.randn(2, 5, n_mics, n_mics, dtype=dtype)
+    b = torch.randn(2, 5, n_mics, 3, dtype=dtype)
+    assert_close(stable_solve(b, a), torch.linalg.solve(a, b))
+    # Singular SCMs (here a silent microphone) are conditioned before solving.
+    a = a @ a.mH
+    a[..., -1, :] = 0
+    a[..., :, -1] = 0
+    assert_close(stable_solve(b, a), torch.linalg.solve(condition_scm(a), b))
+    # Conditioning doesn't change all-zero SCMs, solving fails.
+    with pytest.raises(RuntimeError):
+        stable_solve(b, torch.zeros_like(a))
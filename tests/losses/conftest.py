@@ -0,0 +1,8 @@
+import pytest
+import torch
+
+
+@pytest.fixture(scope="module", params=["cpu", "cuda"] if torch.cuda.is_available() else ["cpu"])
+def device(request):
+    """Run the loss tests on GPU as well, when available."""
+    return torch.device(request.param)
@@ -1,4 +1,5 @@
 import pytest
+import itertools
 import torch
 from torch.testing import assert_close
 import warnings
@@ -45,6 +46,49 @@ def assert_loss_checks_shape(loss_func, shape, arbitrary_last_dim=False, no_batc
                 _test((batch_size, *shape[:dim], 1, *shape[dim:]))
 
 
+@pytest.fixture(autouse=True)
+def _inference_mode():
+    """These tests only run forward passes, don't record the autograd graph."""
+    with torch.inference_mode():
+        yield
+
+
+@pytest.fixture(scope="module")
+def rand_pool(device):
+    """Targets and estimates (stacked on the first dim) of shape (2, 4, 16000).
+    Drawn once per module, tests take slices of it."""
+    generator = torch.Generator().manual_seed(0)
+    return torch.randn(2, 2, 4, 16000, generator=generator).to(device)
+
+
+@pytest.fixture(scope="module")
+def stfts(device):
+    """STFT encoders supported by PMSQE, keyed by sample rate. Built once per module."""
+    return {
+        8000: Encoder(STFTFB(kernel_size=256, n_filters=256, stride=128)).to(device),
+        16000: Encoder(STFTFB(kernel_size=512, n_filters=512, stride=256)).to(device),
+    }
+
+
+@pytest.fixture(scope="module")
+def pmsqe_specs(stfts, rand_pool):
+    """Magnitude spectrograms of the first three targets and estimates of `rand_pool`,
+    keyed by sample rate. Computed once per module, tests take slices of them."""
+    return {
+        sample_rate: tuple(transforms.mag(stft(x.contiguous())) for x in rand_pool[:, :, :3])
+        for sample_rate, stft in stfts.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def multi_scale_spectral(device):
+    """Multi-scale spectral loss with a reduced number of STFT scales. Built once per module."""
+    filt_list = [512, 256, 32]
+    return SingleSrcMultiScaleSpectral(
+        windows_size=filt_list, n_filters=filt_list, hops_size=filt_list
+    ).to(device)
+
+
 loss_properties = [
     # Pairwise loss, singlesrc loss, multisrc loss, arbitrary_last_dim?
     (sdr.pairwise_neg_sisdr, sdr.singlesrc_neg_sisdr, sdr.multisrc_neg_sisdr, False),
@@ -56,26 +100,35 @@ loss_properties = [
 
 @pytest.mark.parametrize("n_src", [2, 3, 4])
 @pytest.mark.parametrize("loss", loss_properties)
-def test_sisdr_and_mse(n_src, loss):
+def test_sisdr_and_mse(n_src, loss, rand_pool):
     # Unpack the triplet
     pairwise, singlesrc, multisrc, _ = loss
     # Fake targets and estimates
-    targets = torch.randn(2, n_src, 10000)
-    est_targets = torch.randn(2, n_src, 10000)
-    # Create the 3 PIT wrappers
+    targets, est_targets = rand_pool[:, :, :n_src, :2048].contiguous()
+    # Create the PIT wrappers
     pw_wrapper = PITLossWrapper(pairwise, pit_from="pw_mtx")
     wo_src_wrapper = PITLossWrapper(singlesrc, pit_from="pw_pt")
-    w_src_wrapper = PITLossWrapper(multisrc, pit_from="perm_avg")
 
     # Circular tests on value
     assert_close(pw_wrapper(est_targets, targets), wo_src_wrapper(est_targets, targets))
-    assert_close(wo_src_wrapper(est_targets, targets), w_src_wrapper(est_targets, targets))
 
     # Circular tests on returned estimates
     assert_close(
         pw_wrapper(est_targets, targets, return_est=True)[1],
         wo_src_wrapper(est_targets, targets, return_est=True)[1],
     )
+
+    if n_src > 3:
+        # Enumerating the n_src! permutations gets expensive, check the multisrc
+        # loss on the best permutation found from the pairwise losses instead.
+        _, batch_indices = PITLossWrapper.find_best_perm(pairwise(est_targets, targets))
+        reordered = PITLossWrapper.reorder_source(est_targets, batch_indices)
+        assert_close(wo_src_wrapper(est_targets, targets), multisrc(reordered, targets).mean())
+        assert_close(wo_src_wrapper(est_targets, targets, return_est=True)[1], reordered)
+        return
+
+    w_src_wrapper = PITLossWrapper(multisrc, pit_from="perm_avg")
+    assert_close(wo_src_wrapper(est_targets, targets), w_src_wrapper(est_targets, targets))
     assert_close(
         wo_src_wrapper(est_targets, targets, return_est=True)[1],
         w_src_wrapper(est_targets, targets, return_est=True)[1],
@@ -94,61 +147,42 @@ def test_sisdr_and_mse_shape_checks(loss):
 
 
 @pytest.mark.parametrize("spk_cnt", [2, 3, 4])
-def test_dc(spk_cnt):
-    embedding = torch.randn(10, 5 * 400, 20)
-    targets = torch.zeros(10, 400, 5).random_(0, spk_cnt).long()
+def test_dc(spk_cnt, device):
+    embedding = torch.randn(10, 5 * 40, 20, device=device)
+    targets = torch.zeros(10, 40, 5, device=device).random_(0, spk_cnt).long()
     loss = deep_clustering_loss(embedding, targets)
     assert loss.shape[0] == 10
 
 
 @pytest.mark.parametrize("n_src", [2, 3])
-def test_multi_scale_spectral_PIT(n_src):
-    # Test in with reduced number of STFT scales.
-    filt_list = [512, 256, 32]
+def test_multi_scale_spectral_PIT(n_src, multi_scale_spectral, rand_pool):
     # Fake targets and estimates
-    targets = torch.randn(2, n_src, 8000)
-    est_targets = torch.randn(2, n_src, 8000)
+    targets, est_targets = rand_pool[:, :, :n_src, :8000].contiguous()
     # Create PITLossWrapper in 'pw_pt' mode
-    pt_loss = SingleSrcMultiScaleSpectral(
-        windows_size=filt_list, n_filters=filt_list, hops_size=filt_list
-    )
-
-    loss_func = PITLossWrapper(pt_loss, pit_from="pw_pt")
+    loss_func = PITLossWrapper(multi_scale_spectral, pit_from="pw_pt")
     # Compute the loss
     loss_func(targets, est_targets)
 
 
-@pytest.mark.parametrize("batch_size", [1, 2])
-def test_multi_scale_spectral_shape(batch_size):
-    # Test in with reduced number of STFT scales.
-    filt_list = [512, 256, 32]
+def test_multi_scale_spectral_shape(multi_scale_spectral, rand_pool):
     # Fake targets and estimates
-    targets = torch.randn(batch_size, 8000)
-    est_targets = torch.randn(batch_size, 8000)
-    # Create PITLossWrapper in 'pw_pt' mode
-    loss_func = SingleSrcMultiScaleSpectral(
-        windows_size=filt_list, n_filters=filt_list, hops_size=filt_list
-    )
-    # Compute the loss
+    targets, est_targets = rand_pool[:, :, 0, :8000].contiguous()
+    loss_func = multi_scale_spectral
+    # Compute the loss on the full batch
     loss = loss_func(targets, est_targets)
-    assert loss.shape[0] == batch_size
+    assert loss.shape == (targets.shape[0],)
+    # Batches of one give the same values as the corresponding slice.
+    assert_close(loss[:1], loss_func(targets[:1], est_targets[:1]))
 
 
 @pytest.mark.parametrize("sample_rate", [8000, 16000])
-def test_pmsqe(sample_rate):
-    # Define supported STFT
-    if sample_rate == 16000:
-        stft = Encoder(STFTFB(kernel_size=512, n_filters=512, stride=256))
-    else:
-        stft = Encoder(STFTFB(kernel_size=256, n_filters=256, stride=128))
+def test_pmsqe(sample_rate, pmsqe_specs):
     # Usage by itself
-    ref, est = torch.randn(2, 1, 16000), torch.randn(2, 1, 16000)
-    ref_spec = transforms.mag(stft(ref))
-    est_spec = transforms.mag(stft(est))
-    loss_func = SingleSrcPMSQE(sample_rate=sample_rate)
+    ref_spec, est_spec = (spec[:, 0] for spec in pmsqe_specs[sample_rate])
+    loss_func = SingleSrcPMSQE(sample_rate=sample_rate).to(ref_spec.device)
     loss_value = loss_func(est_spec, ref_spec)
     # Assert output has shape (batch,)
-    assert loss_value.shape[0] == ref.shape[0]
+    assert loss_value.shape[0] == ref_spec.shape[0]
     # Assert support for transposed inputs.
     tr_loss_value = loss_func(est_spec.transpose(1, 2), ref_spec.transpose(1, 2))
     assert_close(loss_value, tr_loss_value)
@@ -156,32 +190,25 @@ def test_pmsqe(sample_rate):
 
 @pytest.mark.parametrize("n_src", [2, 3])
 @pytest.mark.parametrize("sample_rate", [8000, 16000])
-def test_pmsqe_pit(n_src, sample_rate):
-    # Define supported STFT
-    if sample_rate == 16000:
-        stft = Encoder(STFTFB(kernel_size=512, n_filters=512, stride=256))
-    else:
-        stft = Encoder(STFTFB(kernel_size=256, n_filters=256, stride=128))
-    # Usage by itself
-    ref, est = torch.randn(2, n_src, 16000), torch.randn(2, n_src, 16000)
-    ref_spec = transforms.mag(stft(ref))
-    est_spec = transforms.mag(stft(est))
+def test_pmsqe_pit(n_src, sample_rate, pmsqe_specs):
+    ref_spec, est_spec = (spec[:, :n_src] for spec in pmsqe_specs[sample_rate])
     loss_func = PITLossWrapper(SingleSrcPMSQE(sample_rate=sample_rate), pit_from="pw_pt")
+    loss_func = loss_func.to(ref_spec.device)
     # Assert forward ok.
     loss_func(est_spec, ref_spec)
 
 
 @pytest.mark.parametrize("n_src", [2, 3])
 @pytest.mark.parametrize("sample_rate", [8000, 16000])
-@pytest.mark.parametrize("use_vad", [True, False])
-@pytest.mark.parametrize("extended", [True, False])
-def test_negstoi_pit(n_src, sample_rate, use_vad, extended):
-    ref, est = torch.randn(2, n_src, 8000), torch.randn(2, n_src, 8000)
-    singlesrc_negstoi = SingleSrcNegSTOI(
-        sample_rate=sample_rate, use_vad=use_vad, extended=extended
-    )
-    loss_func = PITLossWrapper(singlesrc_negstoi, pit_from="pw_pt")
-    # Assert forward ok.
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        loss_func(est, ref)
+def test_negstoi_pit(n_src, sample_rate, rand_pool):
+    ref, est = rand_pool[:, :, :n_src, :8000].contiguous()
+    # Only forward is checked, run all the STOI variants on the same inputs.
+    for use_vad, extended in itertools.product([True, False], [True, False]):
+        singlesrc_negstoi = SingleSrcNegSTOI(
+            sample_rate=sample_rate, use_vad=use_vad, extended=extended
+        )
+        loss_func = PITLossWrapper(singlesrc_negstoi, pit_from="pw_pt").to(rand_pool.device)
+        # Assert forward ok.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            loss_func(est, ref)
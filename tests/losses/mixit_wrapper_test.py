@@ -1,8 +1,11 @@
 import pytest
+import itertools
 import torch
+from torch.testing import assert_close
 
 from asteroid.losses import MixITLossWrapper
-from asteroid.losses import pairwise_neg_sisdr, multisrc_neg_sisdr
+from asteroid.losses import pairwise_neg_sisdr, multisrc_neg_sisdr, multisrc_mse
+from asteroid.losses.mixit_wrapper import _parts_mask
 
 
 def good_batch_loss_func(y_pred, y_true):
@@ -73,3 +76,102 @@ def test_mixitwrapper_checks_loss_shape(batch_size, factor, n_mix, time, general
     loss = MixITLossWrapper(pairwise_neg_sisdr, generalized=generalized)
     with pytest.raises(ValueError):
         loss(est_targets, mixtures)
+
+
+def _brute_force_mixit(est_targets, mixtures, generalized):
+    """Best partition loss and mixtures for each batch element, by trying every
+    assignment of the estimated sources to the mixtures."""
+    n_src, n_mix = est_targets.shape[1], mixtures.shape[1]
+    min_losses, best_mixes = [], []
+    for est, mix in zip(est_targets, mixtures):
+        best_loss, best_mix = None, None
+        for assignment in itertools.product(range(n_mix), repeat=n_src):
+            if not generalized and any(assignment.count(m) != n_src // n_mix for m in range(n_mix)):
+                continue
+            parts = [[s for s, a in enumerate(assignment) if a == m] for m in range(n_mix)]
+            est_mix = torch.stack([est[torch.tensor(p, dtype=torch.long)].sum(0) for p in parts])
+            loss = multisrc_mse(est_mix[None], mix[None])[0]
+            if best_loss is None or loss < best_loss:
+                best_loss, best_mix = loss, est_mix
+        min_losses.append(best_loss)
+        best_mixes.append(best_mix)
+    return torch.stack(min_losses), torch.stack(best_mixes)
+
+
+@pytest.mark.parametrize(
+    "generalized,n_mix,n_src",
+    [(False, 2, 2), (False, 2, 4), (False, 3, 6), (True, 2, 3), (True, 2, 4)],
+)
+def test_mixit_values(generalized, n_mix, n_src):
+    batch_size, time = 3, 100
+    mixtures = torch.randn(batch_size, n_mix, time)
+    est_targets = torch.randn(batch_size, n_src, time)
+    if generalized:
+        # The best partition of the first example leaves the second mixture empty.
+        mixtures[0, 0] = est_targets[0].sum(0)
+        mixtures[0, 1] = 0.0
+    ref_loss, ref_mixes = _brute_force_mixit(est_targets, mixtures, generalized)
+
+    if generalized:
+        best_part = MixITLossWrapper.best_part_mixit_generalized
+    else:
+        best_part = MixITLossWrapper.best_part_mixit
+    min_loss, min_loss_idx, parts = best_part(multisrc_mse, est_targets, mixtures)
+    assert_close(min_loss.view(-1), ref_loss)
+    reordered_mix = MixITLossWrapper.reorder_source(est_targets, mixtures, min_loss_idx, parts)
+    assert_close(reordered_mix, ref_mixes)
+
+    loss = MixITLossWrapper(multisrc_mse, generalized=generalized, reduction="none")
+    loss_value, reordered_mix = loss(est_targets, mixtures, return_est=True)
+    assert_close(loss_value.view(-1), ref_loss)
+    assert_close(reordered_mix, ref_mixes)
+    if generalized:
+        assert_close(reordered_mix[0], mixtures[0])
+
+
+@pytest.mark.parametrize("generalized", [True, False])
+def test_mixit_inference_mode_then_backward(generalized):
+    # The partition masks are cached, the first call for this shape happens in inference mode.
+    _parts_mask.cache_clear()
+    mixtures = torch.randn(2, 2, 100)
+    est_targets = torch.randn(2, 4, 100)
+    loss = MixITLossWrapper(multisrc_mse, generalized=generalized)
+    with torch.inference_mode():
+        loss(est_targets, mixtures)
+
+    est_targets.requires_grad_()
+    loss(est_targets, mixtures).backward()
+    assert est_targets.grad is not None
+
+
+def weighted_multisrc_mse(est_targets, targets, weights):
+    return multisrc_mse(est_targets, targets) * weights
+
+
+@pytest.mark.parametrize("generalized", [True, False])
+def test_mixit_batch_kwargs(generalized):
+    mixtures = torch.randn(3, 2, 100)
+    est_targets = torch.randn(3, 4, 100)
+    weights = torch.rand(3)
+    loss = MixITLossWrapper(multisrc_mse, generalized=generalized, reduction="none")
+    w_loss = MixITLossWrapper(weighted_multisrc_mse, generalized=generalized, reduction="none")
+    assert_close(
+        w_loss(est_targets, mixtures, weights=weights).view(-1),
+        loss(est_targets, mixtures).view(-1) * weights,
+    )
+
+
+@pytest.mark.parametrize("generalized", [True, False])
+def test_mixit_parts_not_shared(generalized):
+    mixtures = torch.randn(2, 2, 100)
+    est_targets = torch.randn(2, 4, 100)
+    if generalized:
+        best_part = MixITLossWrapper.best_part_mixit_generalized
+    else:
+        best_part = MixITLossWrapper.best_part_mixit
+    _, _, parts = best_part(multisrc_mse, est_targets, mixtures)
+    expected = [[list(sources) for sources in partition] for partition in parts]
+    # Modifying the returned partitions doesn't change the cached ones.
+    parts[0][0].append(3)
+    parts.pop()
+    assert best_part(multisrc_mse, est_targets, mixtures)[2] == expected
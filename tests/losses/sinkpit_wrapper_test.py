@@ -54,43 +54,88 @@ def test_wrapper(batch_size, n_src, time):
     assert reordered_est.shape == est_targets.shape
 
 
-@pytest.mark.parametrize("batch_size", [1, 2])
-@pytest.mark.parametrize("n_src", [2, 3, 4])
-@pytest.mark.parametrize("beta,n_iter", [(100.0, 2000)])
-@pytest.mark.parametrize(
-    "function_triplet",
-    [
-        [sdr.pairwise_neg_sisdr, sdr.singlesrc_neg_sisdr, sdr.multisrc_neg_sisdr],
-        [sdr.pairwise_neg_sdsdr, sdr.singlesrc_neg_sdsdr, sdr.multisrc_neg_sdsdr],
-        [sdr.pairwise_neg_snr, sdr.singlesrc_neg_snr, sdr.multisrc_neg_snr],
-        [pairwise_mse, singlesrc_mse, multisrc_mse],
-    ],
-)
-def test_proximity_sinkhorn_hungarian(batch_size, n_src, beta, n_iter, function_triplet):
-    time = 16000
-    noise_level = 0.1
+function_triplets = [
+    [sdr.pairwise_neg_sisdr, sdr.singlesrc_neg_sisdr, sdr.multisrc_neg_sisdr],
+    [sdr.pairwise_neg_sdsdr, sdr.singlesrc_neg_sdsdr, sdr.multisrc_neg_sdsdr],
+    [sdr.pairwise_neg_snr, sdr.singlesrc_neg_snr, sdr.multisrc_neg_snr],
+    [pairwise_mse, singlesrc_mse, multisrc_mse],
+]
+
+
+def _permuted_noisy_targets(batch_size, n_src, time, device, noise_level=0.1):
+    targets = torch.randn(batch_size, n_src, time, device=device) * 10  # ground truth
+    noise = torch.randn(batch_size, n_src, time, device=device) * noise_level
+    # reorder channels, and add small noise
+    est_targets = targets[:, torch.randperm(n_src), :] + noise
+    return est_targets, targets
+
+
+@pytest.mark.parametrize("beta,n_iter,tol", [(100.0, 500, 1e-6)])
+@pytest.mark.parametrize("function_triplet", function_triplets)
+def test_proximity_sinkhorn_hungarian(beta, n_iter, tol, function_triplet, device):
+    # Convergence is only checked on the largest case, see
+    # test_sinkhorn_shapes for the other batch sizes and number of sources.
     pairwise, nosrc, nonpit = function_triplet
+    est_targets, targets = _permuted_noisy_targets(2, 4, 16000, device)
 
-    # random data
-    targets = torch.randn(batch_size, n_src, time) * 10  # ground truth
-    noise = torch.randn(batch_size, n_src, time) * noise_level
-    est_targets = (
-        targets[:, torch.randperm(n_src), :] + noise
-    )  # reorder channels, and add small noise
-
-    # initialize wrappers
-    loss_sinkhorn = SinkPITLossWrapper(pairwise, n_iter=n_iter)
-    loss_hungarian = PITLossWrapper(pairwise, pit_from="pw_mtx")
+    # Both algorithms work on the same pairwise losses, compute them once
+    pw_losses = pairwise(est_targets, targets)
 
     # compute loss by sinkhorn
-    loss_sinkhorn.beta = beta
-    mean_loss_sinkhorn = loss_sinkhorn(est_targets, targets, return_est=False)
+    min_loss_sinkhorn, _ = SinkPITLossWrapper.best_softperm_sinkhorn(
+        pw_losses, beta, n_iter, tol=tol
+    )
 
     # compute loss by hungarian
-    mean_loss_hungarian = loss_hungarian(est_targets, targets, return_est=False)
+    min_loss_hungarian, _ = PITLossWrapper.find_best_perm(pw_losses)
 
     # compare
-    assert_close(mean_loss_sinkhorn, mean_loss_hungarian)
+    assert_close(min_loss_sinkhorn.mean(), min_loss_hungarian.mean())
+
+
+@pytest.mark.parametrize("batch_size", [1, 2])
+@pytest.mark.parametrize("n_src", [2, 3, 4])
+@pytest.mark.parametrize("function_triplet", function_triplets)
+def test_sinkhorn_shapes(batch_size, n_src, function_triplet, device):
+    pairwise, nosrc, nonpit = function_triplet
+    est_targets, targets = _permuted_noisy_targets(batch_size, n_src, 1000, device)
+
+    loss_sinkhorn = SinkPITLossWrapper(pairwise, n_iter=200)
+    loss_sinkhorn.beta = 100.0
+    mean_loss = loss_sinkhorn(est_targets, targets, return_est=False)
+    assert mean_loss.ndim == 0
+    assert torch.isfinite(mean_loss)
+
+    pw_losses = pairwise(est_targets, targets)
+    min_loss, soft_perm = SinkPITLossWrapper.best_softperm_sinkhorn(pw_losses, 100.0, 200)
+    assert min_loss.shape == (batch_size,)
+    assert soft_perm.shape == (batch_size, n_src, n_src)
+
+
+def test_sinkhorn_early_stopping(device):
+    est_targets, targets = _permuted_noisy_targets(2, 3, 1000, device)
+    pw_losses = sdr.pairwise_neg_sisdr(est_targets, targets).double()
+    beta, n_iter = 100.0, 500
+
+    # Stopping once converged gives the same result as running all the iterations.
+    min_loss, soft_perm = SinkPITLossWrapper.best_softperm_sinkhorn(pw_losses, beta, n_iter)
+    min_loss_tol, soft_perm_tol = SinkPITLossWrapper.best_softperm_sinkhorn(
+        pw_losses, beta, n_iter, tol=1e-6
+    )
+    assert_close(min_loss_tol, min_loss, rtol=1e-5, atol=1e-5)
+    assert_close(soft_perm_tol, soft_perm, rtol=1e-5, atol=1e-5)
+
+    # A loose tolerance stops at the first check, after two iterations.
+    assert_close(
+        SinkPITLossWrapper.best_softperm_sinkhorn(pw_losses, beta, n_iter, tol=1e10),
+        SinkPITLossWrapper.best_softperm_sinkhorn(pw_losses, beta, 2),
+    )
+
+    # Same through the wrapper
+    loss = SinkPITLossWrapper(sdr.pairwise_neg_sisdr, n_iter=n_iter)
+    loss_tol = SinkPITLossWrapper(sdr.pairwise_neg_sisdr, n_iter=n_iter, tol=1e-6)
+    loss.beta = loss_tol.beta = beta
+    assert_close(loss_tol(est_targets, targets), loss(est_targets, targets), rtol=1e-4, atol=1e-4)
 
 
 class _TestCallback(pl.callbacks.Callback):
@@ -121,7 +166,7 @@ class _TestCallback(pl.callbacks.Callback):
         lambda epoch: 123.0 if epoch < 3 else 456.0,  # test if lambda function works
     ],
 )
-def test_sinkpit_beta_scheduler(batch_size, n_src, len_wave, beta_schedule):
+def test_sinkpit_beta_scheduler(batch_size, n_src, len_wave, beta_schedule, tmp_path):
     model = nn.Sequential(nn.Conv1d(1, n_src, 1), nn.ReLU())
     optimizer = optim.Adam(model.parameters(), lr=1e-3)
     dataset = DummyWaveformDataset(total=2 * batch_size, n_src=n_src, len_wave=len_wave)
@@ -140,6 +185,7 @@ def test_sinkpit_beta_scheduler(batch_size, n_src, len_wave, beta_schedule):
     trainer = pl.Trainer(
         max_epochs=10,
         fast_dev_run=False,
+        default_root_dir=tmp_path,
         callbacks=[
             SinkPITBetaScheduler(beta_schedule),
             _TestCallback(